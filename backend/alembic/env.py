@@ -12,6 +12,7 @@ from alembic import context
 
 sys.path.append(os.getcwd())
 from config import settings
+from database import enable_archive
 from models import Base
 
 # this is the Alembic Config object, which provides
@@ -20,7 +21,8 @@ config = context.config
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
-if config.config_file_name is not None:
+# Skipped when the app runs migrations in-process, so its own logging is left alone.
+if config.config_file_name is not None and "connection" not in config.attributes:
     fileConfig(config.config_file_name)
 
 # add your model's MetaData object here
@@ -32,6 +34,17 @@ target_metadata = Base.metadata
 # Override sqlalchemy.url with environment variable
 config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
 
+# Expenses are archived into a separate `archive` schema (an attached database on SQLite),
+# so autogenerate has to look beyond the default schema, but no further.
+ARCHIVE_SCHEMA = "archive"
+
+
+def include_name(name, type_, parent_names):
+    if type_ == "schema":
+        return name in (None, ARCHIVE_SCHEMA)
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -56,6 +69,8 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_schemas=True,
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -72,6 +87,7 @@ async def run_async_migrations() -> None:
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
     )
+    enable_archive(connectable)
 
     async with connectable.connect() as connection:
         await connection.run_sync(do_run_migrations)
@@ -80,7 +96,12 @@ async def run_async_migrations() -> None:
 
 
 def do_run_migrations(connection):
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_schemas=True,
+        include_name=include_name,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
@@ -89,6 +110,12 @@ def do_run_migrations(connection):
 def run_migrations_online() -> None:
     """Run migrations in 'online' mode."""
 
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        # Called from migrations.py with a connection the app already holds
+        do_run_migrations(connection)
+        return
+
     asyncio.run(run_async_migrations())
 
 
@@ -0,0 +1,46 @@
+"""Add soft delete to expenses
+
+Revision ID: 3b9d2f6a1c47
+Revises: 181c739d87e8
+Create Date: 2026-10-19 09:12:41.204518
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9d2f6a1c47'
+down_revision: Union[str, Sequence[str], None] = '181c739d87e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('expenses', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.create_index(
+        'ix_expenses_live_child_id_date',
+        'expenses',
+        ['child_id', 'date'],
+        unique=False,
+        postgresql_where=sa.text('deleted_at IS NULL'),
+        sqlite_where=sa.text('deleted_at IS NULL'),
+    )
+    op.create_index(
+        'ix_expenses_tombstone_deleted_at',
+        'expenses',
+        ['deleted_at'],
+        unique=False,
+        postgresql_where=sa.text('deleted_at IS NOT NULL'),
+        sqlite_where=sa.text('deleted_at IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_expenses_tombstone_deleted_at', table_name='expenses')
+    op.drop_index('ix_expenses_live_child_id_date', table_name='expenses')
+    op.drop_column('expenses', 'deleted_at')
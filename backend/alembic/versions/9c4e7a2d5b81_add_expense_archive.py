@@ -0,0 +1,55 @@
+"""Add expense archive
+
+Revision ID: 9c4e7a2d5b81
+Revises: 3b9d2f6a1c47
+Create Date: 2026-10-19 10:03:27.518240
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4e7a2d5b81'
+down_revision: Union[str, Sequence[str], None] = '3b9d2f6a1c47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # On SQLite `archive` is the attached database file (see database.enable_archive)
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('CREATE SCHEMA IF NOT EXISTS archive')
+    op.create_table('archived_expenses',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('date', sa.DateTime(), nullable=False),
+    sa.Column('amount', sa.Float(), nullable=False),
+    sa.Column('description', sa.String(), nullable=False),
+    sa.Column('category', sa.String(), nullable=False),
+    sa.Column('child_id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id', 'date'),
+    schema='archive',
+    postgresql_partition_by='RANGE (date)'
+    )
+    op.create_index(
+        'ix_archived_expenses_child_id_date', 'archived_expenses', ['child_id', 'date'], unique=False, schema='archive'
+    )
+    op.create_table('archived_expense_totals',
+    sa.Column('child_id', sa.Integer(), nullable=False),
+    sa.Column('category', sa.String(), nullable=False),
+    sa.Column('total_amount', sa.Float(), nullable=False),
+    sa.Column('expense_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['child_id'], ['children.id'], ),
+    sa.PrimaryKeyConstraint('child_id', 'category')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('archived_expense_totals')
+    op.drop_index('ix_archived_expenses_child_id_date', table_name='archived_expenses', schema='archive')
+    # Drops the yearly partitions along with the parent on Postgres
+    op.drop_table('archived_expenses', schema='archive')
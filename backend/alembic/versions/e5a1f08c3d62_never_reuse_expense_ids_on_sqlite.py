@@ -0,0 +1,42 @@
+"""Never reuse expense ids on SQLite
+
+Revision ID: e5a1f08c3d62
+Revises: 9c4e7a2d5b81
+Create Date: 2026-10-20 11:24:06.731904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a1f08c3d62'
+down_revision: Union[str, Sequence[str], None] = '9c4e7a2d5b81'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Postgres sequences never hand out an id twice; only SQLite needs rebuilding
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    with op.batch_alter_table('expenses', recreate='always', table_kwargs={'sqlite_autoincrement': True}):
+        pass
+    # Start the sequence past every id already moved to the archive, not just the hot ones
+    op.execute("DELETE FROM sqlite_sequence WHERE name = 'expenses'")
+    op.execute(
+        "INSERT INTO sqlite_sequence (name, seq) "
+        "SELECT 'expenses', max_id FROM ("
+        "SELECT MAX(id) AS max_id FROM ("
+        "SELECT id FROM expenses UNION ALL SELECT id FROM archive.archived_expenses"
+        ")) WHERE max_id IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    with op.batch_alter_table('expenses', recreate='always', table_kwargs={'sqlite_autoincrement': False}):
+        pass
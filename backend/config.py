@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -5,16 +7,33 @@ class Settings(BaseSettings):
     # Default to SQLite for local development in sandbox
     DATABASE_URL: str = "sqlite+aiosqlite:///./holiday_tracker.db"
     ADMIN_PIN: str = "1122"
+    # Soft-deleted expenses are kept this long before the purge job hard-deletes them
+    EXPENSE_PURGE_RETENTION_DAYS: int = 30
+    EXPENSE_PURGE_INTERVAL_SECONDS: int = 3600
+    EXPENSE_PURGE_BATCH_SIZE: int = 500
+    # Expenses dated before this many days ago are moved to the archive; unset disables archiving
+    EXPENSE_ARCHIVE_AFTER_DAYS: Optional[int] = None
+    EXPENSE_ARCHIVE_INTERVAL_SECONDS: int = 86400
+    EXPENSE_ARCHIVE_BATCH_SIZE: int = 500
+    # SQLite only: the database file attached as the `archive` schema
+    ARCHIVE_SQLITE_PATH: str = "./holiday_tracker_archive.db"
+    # Apply pending alembic migrations in-process at startup instead of via `alembic upgrade head`
+    RUN_MIGRATIONS_ON_STARTUP: bool = False
+    # How long /readyz reuses its last database ping
+    READINESS_CACHE_SECONDS: float = 5.0
 
     class Config:
         env_file = ".env"
 
-settings = Settings()
+def normalize_database_url(url: str) -> str:
+    # Fix for Render's postgres:// URL scheme which SQLAlchemy might not like with asyncpg,
+    # or might default to psycopg2 if not specified.
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgresql://") and "asyncpg" not in url:
+        # If it's just postgresql://, force asyncpg
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
 
-# Fix for Render's postgres:// URL scheme which SQLAlchemy might not like with asyncpg,
-# or might default to psycopg2 if not specified.
-if settings.DATABASE_URL.startswith("postgres://"):
-    settings.DATABASE_URL = settings.DATABASE_URL.replace("postgres://", "postgresql+asyncpg://", 1)
-elif settings.DATABASE_URL.startswith("postgresql://") and "asyncpg" not in settings.DATABASE_URL:
-     # If it's just postgresql://, force asyncpg
-     settings.DATABASE_URL = settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+settings = Settings()
+settings.DATABASE_URL = normalize_database_url(settings.DATABASE_URL)
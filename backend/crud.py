@@ -1,11 +1,12 @@
-from datetime import timezone
+from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import func
+from sqlalchemy import case, delete, func, insert, or_, text, union_all, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 import schemas
-from models import Child, Expense
+from models import ArchivedExpense, ArchivedExpenseTotal, Child, Expense
 
 
 async def get_child_by_name(db: AsyncSession, name: str):
@@ -27,30 +28,56 @@ async def get_child(db: AsyncSession, child_id: int):
     result = await db.execute(select(Child).filter(Child.id == child_id))
     return result.scalars().first()
 
-async def get_expenses_by_child(db: AsyncSession, child_id: int):
-    result = await db.execute(select(Expense).filter(Expense.child_id == child_id).order_by(Expense.date.desc()))
-    return result.scalars().all()
+def _utcnow():
+    # Naive UTC to match the TIMESTAMP WITHOUT TIME ZONE columns
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def _live():
+    return Expense.deleted_at.is_(None)
+
+async def get_expenses_by_child(db: AsyncSession, child_id: int, include_archived: bool = False):
+    result = await db.execute(
+        select(Expense).filter(Expense.child_id == child_id, _live()).order_by(Expense.date.desc())
+    )
+    expenses = result.scalars().all()
+    if not include_archived:
+        return expenses
+
+    archived = await db.execute(select(ArchivedExpense).filter(ArchivedExpense.child_id == child_id))
+    return sorted([*expenses, *archived.scalars().all()], key=lambda e: e.date, reverse=True)
 
 async def get_child_total_expense(db: AsyncSession, child_id: int):
     # Total
-    total_query = select(func.sum(Expense.amount)).filter(Expense.child_id == child_id)
+    total_query = select(func.sum(Expense.amount)).filter(Expense.child_id == child_id, _live())
     total_res = await db.execute(total_query)
     total = total_res.scalar() or 0.0
 
     # Cash
     cash_query = select(func.sum(Expense.amount)).filter(
-        Expense.child_id == child_id, Expense.category == "cash"
+        Expense.child_id == child_id, Expense.category == "cash", _live()
     )
     cash_res = await db.execute(cash_query)
     cash = cash_res.scalar() or 0.0
 
     # Card
     card_query = select(func.sum(Expense.amount)).filter(
-        Expense.child_id == child_id, Expense.category == "card"
+        Expense.child_id == child_id, Expense.category == "card", _live()
     )
     card_res = await db.execute(card_query)
     card = card_res.scalar() or 0.0
 
+    # Archived history
+    archived_query = select(ArchivedExpenseTotal.category, ArchivedExpenseTotal.total_amount).filter(
+        ArchivedExpenseTotal.child_id == child_id
+    )
+    archived_res = await db.execute(archived_query)
+    for category, amount in archived_res.all():
+        total += amount
+        if category == "cash":
+            cash += amount
+        elif category == "card":
+            card += amount
+
     return {
         "child_id": child_id,
         "total_amount": total,
@@ -58,6 +85,96 @@ async def get_child_total_expense(db: AsyncSession, child_id: int):
         "total_card": card,
     }
 
+_EXPENSE_COLUMNS = ("id", "amount", "description", "category", "date", "child_id")
+
+async def get_expenses_for_children(
+    db: AsyncSession, child_ids, default_limit=None, limits=None, include_archived: bool = False
+):
+    """Latest live expenses for many children in one query, keyed by child_id.
+
+    `limits` maps child_id to a per-child row limit and overrides `default_limit`;
+    a limit of None means no limit. With `include_archived`, archived expenses are ranked
+    together with hot ones, so the limits apply across both. Rows are returned as plain
+    column rows since they may come from either table.
+    """
+    source = select(*(getattr(Expense, c) for c in _EXPENSE_COLUMNS)).where(
+        Expense.child_id.in_(child_ids), _live()
+    )
+    if include_archived:
+        source = union_all(
+            source,
+            select(*(getattr(ArchivedExpense, c) for c in _EXPENSE_COLUMNS)).where(
+                ArchivedExpense.child_id.in_(child_ids)
+            ),
+        )
+    source = source.subquery()
+    ranked = select(
+        source,
+        func.row_number()
+        .over(partition_by=source.c.child_id, order_by=(source.c.date.desc(), source.c.id.desc()))
+        .label("rn"),
+    ).subquery()
+
+    query = select(*(ranked.c[c] for c in _EXPENSE_COLUMNS)).order_by(ranked.c.child_id, ranked.c.rn)
+    if limits:
+        limit = case(limits, value=ranked.c.child_id, else_=default_limit)
+        query = query.where(or_(limit.is_(None), ranked.c.rn <= limit))
+    elif default_limit is not None:
+        query = query.where(ranked.c.rn <= default_limit)
+
+    result = await db.execute(query)
+    expenses = {child_id: [] for child_id in child_ids}
+    for expense in result.all():
+        expenses[expense.child_id].append(expense)
+    return expenses
+
+def _category_sum(amount, category_column, category):
+    return func.sum(case((category_column == category, amount), else_=0.0))
+
+async def get_children_totals(db: AsyncSession, child_ids):
+    """Spend summaries (hot rows plus archived totals) keyed by child_id, in one query.
+
+    Ids with no matching child are left out, so this doubles as the existence check.
+    """
+    hot = (
+        select(
+            Expense.child_id,
+            func.sum(Expense.amount).label("total"),
+            _category_sum(Expense.amount, Expense.category, "cash").label("cash"),
+            _category_sum(Expense.amount, Expense.category, "card").label("card"),
+        )
+        .where(Expense.child_id.in_(child_ids), _live())
+        .group_by(Expense.child_id)
+        .subquery()
+    )
+    cold = (
+        select(
+            ArchivedExpenseTotal.child_id,
+            func.sum(ArchivedExpenseTotal.total_amount).label("total"),
+            _category_sum(ArchivedExpenseTotal.total_amount, ArchivedExpenseTotal.category, "cash").label("cash"),
+            _category_sum(ArchivedExpenseTotal.total_amount, ArchivedExpenseTotal.category, "card").label("card"),
+        )
+        .where(ArchivedExpenseTotal.child_id.in_(child_ids))
+        .group_by(ArchivedExpenseTotal.child_id)
+        .subquery()
+    )
+    query = (
+        select(
+            Child.id,
+            func.coalesce(hot.c.total, 0.0) + func.coalesce(cold.c.total, 0.0),
+            func.coalesce(hot.c.cash, 0.0) + func.coalesce(cold.c.cash, 0.0),
+            func.coalesce(hot.c.card, 0.0) + func.coalesce(cold.c.card, 0.0),
+        )
+        .outerjoin(hot, hot.c.child_id == Child.id)
+        .outerjoin(cold, cold.c.child_id == Child.id)
+        .where(Child.id.in_(child_ids))
+    )
+    result = await db.execute(query)
+    return {
+        child_id: {"child_id": child_id, "total_amount": total, "total_cash": cash, "total_card": card}
+        for child_id, total, cash, card in result.all()
+    }
+
 async def create_expense(db: AsyncSession, expense: schemas.ExpenseCreate):
     # Ensure date is naive UTC for PostgreSQL TIMESTAMP WITHOUT TIME ZONE
     if expense.date.tzinfo is not None:
@@ -70,15 +187,117 @@ async def create_expense(db: AsyncSession, expense: schemas.ExpenseCreate):
     return db_expense
 
 async def delete_expense(db: AsyncSession, expense_id: int):
-    result = await db.execute(select(Expense).filter(Expense.id == expense_id))
+    # Soft delete: tombstone the row in a single UPDATE ... RETURNING so it can be restored later
+    result = await db.execute(
+        update(Expense)
+        .where(Expense.id == expense_id, _live())
+        .values(deleted_at=_utcnow())
+        .returning(Expense)
+    )
     db_expense = result.scalars().first()
-    if db_expense:
-        await db.delete(db_expense)
-        await db.commit()
+    await db.commit()
+    return db_expense
+
+async def restore_expense(db: AsyncSession, expense_id: int):
+    result = await db.execute(
+        update(Expense)
+        .where(Expense.id == expense_id, Expense.deleted_at.is_not(None))
+        .values(deleted_at=None)
+        .returning(Expense)
+    )
+    db_expense = result.scalars().first()
+    await db.commit()
     return db_expense
 
+async def purge_deleted_expenses(db: AsyncSession, retention: timedelta, batch_size: int):
+    """Hard-delete tombstones older than `retention`, one bounded batch per transaction."""
+    cutoff = _utcnow() - retention
+    purged = 0
+    while True:
+        batch = (
+            select(Expense.id)
+            .where(Expense.deleted_at.is_not(None), Expense.deleted_at < cutoff)
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            delete(Expense).where(Expense.id.in_(batch)).execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        purged += result.rowcount
+        if result.rowcount < batch_size:
+            break
+    return purged
+
+async def _ensure_archive_partitions(db: AsyncSession, years):
+    # Postgres needs a partition covering each year before rows can be routed into it
+    if db.bind.dialect.name != "postgresql":
+        return
+    for year in sorted(years):
+        await db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS archive.archived_expenses_{year} "
+            f"PARTITION OF archive.archived_expenses FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+        ))
+
+def _upsert_archive_totals(db: AsyncSession, rows):
+    dialect = postgresql if db.bind.dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(ArchivedExpenseTotal).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[ArchivedExpenseTotal.child_id, ArchivedExpenseTotal.category],
+        set_={
+            "total_amount": ArchivedExpenseTotal.total_amount + stmt.excluded.total_amount,
+            "expense_count": ArchivedExpenseTotal.expense_count + stmt.excluded.expense_count,
+        },
+    )
+
+async def archive_expenses(db: AsyncSession, cutoff: datetime, batch_size: int):
+    """Move live expenses dated before `cutoff` into the archive, one bounded batch per transaction.
+
+    Each batch is removed from `expenses`, copied into `archived_expenses` and folded into
+    `archived_expense_totals` in the same transaction, so totals never double count. The rows
+    come from `DELETE ... RETURNING` with the live filter reapplied, so an expense soft-deleted
+    after the batch was picked is left alone rather than archived.
+    """
+    archived = 0
+    while True:
+        ids_res = await db.execute(
+            select(Expense.id).where(_live(), Expense.date < cutoff).order_by(Expense.id).limit(batch_size)
+        )
+        ids = ids_res.scalars().all()
+        if not ids:
+            break
+
+        deleted = await db.execute(
+            delete(Expense)
+            .where(Expense.id.in_(ids), _live())
+            .returning(
+                Expense.id, Expense.date, Expense.amount, Expense.description, Expense.category, Expense.child_id
+            )
+            .execution_options(synchronize_session=False)
+        )
+        rows = [dict(row._mapping) for row in deleted.all()]
+        if rows:
+            await _ensure_archive_partitions(db, {row["date"].year for row in rows})
+            await db.execute(insert(ArchivedExpense), rows)
+
+            totals = {}
+            for row in rows:
+                key = (row["child_id"], row["category"])
+                amount, count = totals.get(key, (0.0, 0))
+                totals[key] = (amount + row["amount"], count + 1)
+            await db.execute(_upsert_archive_totals(db, [
+                {"child_id": child_id, "category": category, "total_amount": amount, "expense_count": count}
+                for (child_id, category), (amount, count) in totals.items()
+            ]))
+
+        await db.commit()
+        archived += len(rows)
+        if len(ids) < batch_size:
+            break
+    return archived
+
 async def update_expense(db: AsyncSession, expense_id: int, expense_update: schemas.ExpenseUpdate):
-    result = await db.execute(select(Expense).filter(Expense.id == expense_id))
+    result = await db.execute(select(Expense).filter(Expense.id == expense_id, _live()))
     db_expense = result.scalars().first()
     if not db_expense:
         return None
@@ -1,3 +1,8 @@
+import os
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
@@ -13,6 +18,37 @@ SessionLocal = sessionmaker(
 )
 Base = declarative_base()
 
+def enable_archive(engine, sqlite_path: Optional[str] = None):
+    """On SQLite, attach the archive database file as the `archive` schema on every connection.
+
+    Postgres keeps the archive in a real schema created by migrations, so nothing is needed there.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    path = sqlite_path or settings.ARCHIVE_SQLITE_PATH
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def attach_archive(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("ATTACH DATABASE ? AS archive", (path,))
+        cursor.close()
+
+def archive_path_for(database_url: str) -> str:
+    """The SQLite archive file that belongs with `database_url`.
+
+    That is ARCHIVE_SQLITE_PATH for the app's own database, and `<name>_archive.db` next to
+    any other database file, so tools pointed elsewhere never touch the app's archive.
+    """
+    if database_url == settings.DATABASE_URL:
+        return settings.ARCHIVE_SQLITE_PATH
+    database = make_url(database_url).database
+    if not database or database == ":memory:":
+        return ":memory:"
+    root, ext = os.path.splitext(database)
+    return f"{root}_archive{ext or '.db'}"
+
+enable_archive(engine)
+
 async def get_db():
     async with SessionLocal() as session:
         yield session
@@ -0,0 +1,46 @@
+import asyncio
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class Readiness:
+    """Tracks whether the app can serve traffic.
+
+    The database ping is cached for `ttl` seconds so frequent platform probes
+    don't each take a pooled connection.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.schema_ready = False
+        self.detail = "Starting up"
+        self._db_ok = False
+        self._checked_at = None
+        self._lock = asyncio.Lock()
+
+    def mark_schema_ready(self):
+        self.schema_ready = True
+        self.detail = None
+
+    def mark_failed(self, detail: str):
+        self.schema_ready = False
+        self.detail = detail
+
+    async def check(self, db: AsyncSession):
+        if not self.schema_ready:
+            return False, self.detail
+
+        async with self._lock:
+            now = time.monotonic()
+            if self._checked_at is None or now - self._checked_at >= self.ttl:
+                try:
+                    await db.execute(text("SELECT 1"))
+                    self._db_ok = True
+                except Exception as exc:
+                    print(f"Readiness check failed: {exc}")
+                    self._db_ok = False
+                self._checked_at = now
+
+        return self._db_ok, None if self._db_ok else "Database unavailable"
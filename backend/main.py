@@ -1,4 +1,5 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from typing import List
 
 from fastapi import APIRouter, Depends, FastAPI, Header, HTTPException
@@ -9,23 +10,51 @@ import crud
 import schemas
 from config import settings
 from database import engine, get_db
+from health import Readiness
+from migrations import ensure_schema
+from tasks import archive_expenses_forever, purge_tombstones_forever
 
 CHILDREN_NAMES = ["Xav", "Emma", "Frankie", "Zoe"]
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    # Startup: Seed database
-    # Note: Tables are created by Alembic via start command, so we don't run create_all here
+readiness = Readiness(ttl=settings.READINESS_CACHE_SECONDS)
+
+async def prepare_database(background_tasks):
+    # Note: Tables are created by Alembic migrations, so we don't run create_all here
     # to avoid conflicts.
+    try:
+        if not await ensure_schema(engine, run_migrations=settings.RUN_MIGRATIONS_ON_STARTUP):
+            readiness.mark_failed("Database schema is out of date")
+            return
+
+        # Seed database
+        async with AsyncSession(engine) as session:
+            for name in CHILDREN_NAMES:
+                child = await crud.get_child_by_name(session, name)
+                if not child:
+                    print(f"Seeding child: {name}")
+                    await crud.create_child(session, schemas.ChildCreate(name=name))
+    except Exception as exc:
+        print(f"Database startup failed: {exc}")
+        readiness.mark_failed("Database startup failed")
+        return
+
+    readiness.mark_schema_ready()
+    background_tasks.append(asyncio.create_task(purge_tombstones_forever()))
+    if settings.EXPENSE_ARCHIVE_AFTER_DAYS is not None:
+        background_tasks.append(asyncio.create_task(archive_expenses_forever()))
 
-    async with AsyncSession(engine) as session:
-        for name in CHILDREN_NAMES:
-            child = await crud.get_child_by_name(session, name)
-            if not child:
-                print(f"Seeding child: {name}")
-                await crud.create_child(session, schemas.ChildCreate(name=name))
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup: migrate and seed in the background so the app starts serving /healthz
+    # straight away; /readyz reports ready once the database is prepared.
+    background_tasks = []
+    background_tasks.append(asyncio.create_task(prepare_database(background_tasks)))
     yield
     # Shutdown
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
 
 app = FastAPI(title="Holiday Spending Tracker", lifespan=lifespan)
 
@@ -38,6 +67,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.get("/healthz")
+async def healthz():
+    # Liveness only: never touches the database
+    return {"status": "ok"}
+
+@app.get("/readyz")
+async def readyz(db: AsyncSession = Depends(get_db)):
+    ready, detail = await readiness.check(db)
+    if not ready:
+        raise HTTPException(status_code=503, detail=detail)
+    return {"status": "ready"}
+
 # Dependencies
 def verify_admin_pin(x_admin_pin: str = Header(None)):
     if x_admin_pin != settings.ADMIN_PIN:
@@ -52,11 +93,11 @@ async def read_children(db: AsyncSession = Depends(get_db)):
     return children
 
 @router.get("/children/{child_id}/expenses", response_model=List[schemas.Expense])
-async def read_child_expenses(child_id: int, db: AsyncSession = Depends(get_db)):
+async def read_child_expenses(child_id: int, include_archived: bool = False, db: AsyncSession = Depends(get_db)):
     child = await crud.get_child(db, child_id)
     if not child:
         raise HTTPException(status_code=404, detail="Child not found")
-    expenses = await crud.get_expenses_by_child(db, child_id)
+    expenses = await crud.get_expenses_by_child(db, child_id, include_archived=include_archived)
     return expenses
 
 @router.get("/children/{child_id}/total", response_model=schemas.ChildSpendSummary)
@@ -68,6 +109,26 @@ async def read_child_total(child_id: int, db: AsyncSession = Depends(get_db)):
     summary = await crud.get_child_total_expense(db, child_id)
     return summary
 
+@router.post("/children/batch", response_model=schemas.ChildrenBatchResponse)
+async def read_children_batch(batch: schemas.ChildrenBatchRequest, db: AsyncSession = Depends(get_db)):
+    child_ids = list(dict.fromkeys(batch.child_ids))
+    summaries = await crud.get_children_totals(db, child_ids)
+    found_ids = [child_id for child_id in child_ids if child_id in summaries]
+    # Only limits for children that exist reach the query's CASE
+    limits = {child_id: batch.limits[child_id] for child_id in found_ids if child_id in batch.limits}
+    expenses = {}
+    if found_ids:
+        expenses = await crud.get_expenses_for_children(
+            db, found_ids, batch.limit, limits, include_archived=batch.include_archived
+        )
+    return {
+        "children": [
+            {"child_id": child_id, "expenses": expenses[child_id], "summary": summaries[child_id]}
+            for child_id in found_ids
+        ],
+        "missing_child_ids": [child_id for child_id in child_ids if child_id not in summaries],
+    }
+
 @router.post("/expenses", response_model=schemas.Expense, dependencies=[Depends(verify_admin_pin)])
 async def create_expense(expense: schemas.ExpenseCreate, db: AsyncSession = Depends(get_db)):
     child = await crud.get_child(db, expense.child_id)
@@ -89,6 +150,13 @@ async def delete_expense(expense_id: int, db: AsyncSession = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Expense not found")
     return {"status": "success", "id": expense_id}
 
+@router.post("/expenses/{expense_id}/restore", response_model=schemas.Expense, dependencies=[Depends(verify_admin_pin)])
+async def restore_expense(expense_id: int, db: AsyncSession = Depends(get_db)):
+    db_expense = await crud.restore_expense(db, expense_id)
+    if not db_expense:
+        raise HTTPException(status_code=404, detail="Deleted expense not found")
+    return db_expense
+
 @router.post("/verify-pin")
 async def check_pin(x_admin_pin: str = Header(None)):
     verify_admin_pin(x_admin_pin)
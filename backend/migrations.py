@@ -0,0 +1,68 @@
+import os
+
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import exc, text
+
+from alembic import command
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini")
+
+# Arbitrary key shared by every instance so only one of them migrates at a time
+MIGRATION_LOCK_ID = 7_220_112
+
+
+def head_revision():
+    # Reads the version scripts only; env.py and the database are not touched
+    return ScriptDirectory.from_config(Config(ALEMBIC_INI)).get_current_head()
+
+
+async def current_revision(conn):
+    try:
+        result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+    except exc.DBAPIError:
+        # No version table yet: the database has never been migrated
+        await conn.rollback()
+        return None
+    revision = result.scalar()
+    await conn.commit()
+    return revision
+
+
+def _upgrade(sync_conn):
+    config = Config(ALEMBIC_INI)
+    # env.py picks this up instead of building its own engine
+    config.attributes["connection"] = sync_conn
+    command.upgrade(config, "head")
+
+
+async def ensure_schema(engine, run_migrations: bool):
+    """Check the database is at the alembic head revision, optionally upgrading it.
+
+    Returns True if the schema is up to date. Upgrades run on Postgres under an advisory
+    lock, so instances starting together wait for one another instead of racing.
+    """
+    head = head_revision()
+    async with engine.connect() as conn:
+        current = await current_revision(conn)
+        if current == head:
+            return True
+        if not run_migrations:
+            print(f"Database is at revision {current}, expected {head}; not running migrations")
+            return False
+
+        is_postgres = conn.dialect.name == "postgresql"
+        if is_postgres:
+            await conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+            await conn.commit()
+        try:
+            # Another instance may have finished while we waited for the lock
+            if await current_revision(conn) != head:
+                print(f"Migrating database from revision {current} to {head}")
+                await conn.run_sync(_upgrade)
+                await conn.commit()
+        finally:
+            if is_postgres:
+                await conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+                await conn.commit()
+    return True
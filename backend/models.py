@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String, text
 from sqlalchemy.orm import relationship
 
 from database import Base
@@ -16,6 +16,25 @@ class Child(Base):
 
 class Expense(Base):
     __tablename__ = "expenses"
+    __table_args__ = (
+        # Reads only ever look at live rows, so keep their index free of tombstones
+        Index(
+            "ix_expenses_live_child_id_date",
+            "child_id",
+            "date",
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+        # Lets the purge job find old tombstones without scanning live rows
+        Index(
+            "ix_expenses_tombstone_deleted_at",
+            "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+            sqlite_where=text("deleted_at IS NOT NULL"),
+        ),
+        # Archived rows keep their ids, so SQLite must never hand a moved-out id to a new row
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     amount = Column(Float, nullable=False)
@@ -23,5 +42,36 @@ class Expense(Base):
     category = Column(String, default="cash", nullable=False, server_default="cash")
     date = Column(DateTime, default=datetime.utcnow)
     child_id = Column(Integer, ForeignKey("children.id"))
+    deleted_at = Column(DateTime, nullable=True)
 
     child = relationship("Child", back_populates="expenses")
+
+class ArchivedExpense(Base):
+    """Cold expense history moved out of `expenses` by the archive job.
+
+    Lives in the `archive` schema: a range-partitioned table on Postgres, and a table in
+    an attached database file on SQLite (see `database.enable_archive`).
+    """
+    __tablename__ = "archived_expenses"
+    __table_args__ = (
+        Index("ix_archived_expenses_child_id_date", "child_id", "date"),
+        {"schema": "archive", "postgresql_partition_by": "RANGE (date)"},
+    )
+
+    # The partition key has to be part of the primary key on Postgres
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    date = Column(DateTime, primary_key=True)
+    amount = Column(Float, nullable=False)
+    description = Column(String, nullable=False)
+    category = Column(String, nullable=False)
+    # No foreign key: SQLite can't reference tables across attached databases
+    child_id = Column(Integer, nullable=False)
+
+class ArchivedExpenseTotal(Base):
+    """Pre-computed per-child, per-category totals of everything in the archive."""
+    __tablename__ = "archived_expense_totals"
+
+    child_id = Column(Integer, ForeignKey("children.id"), primary_key=True)
+    category = Column(String, primary_key=True)
+    total_amount = Column(Float, nullable=False, default=0.0)
+    expense_count = Column(Integer, nullable=False, default=0)
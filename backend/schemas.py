@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, NonNegativeInt
 
 
 # Child Schemas
@@ -48,3 +48,22 @@ class ChildSpendSummary(BaseModel):
     total_amount: float
     total_cash: float
     total_card: float
+
+# Batch reads
+class ChildrenBatchRequest(BaseModel):
+    child_ids: List[int] = Field(min_length=1, max_length=100)
+    # Per-child expense limit; None returns every expense
+    limit: Optional[NonNegativeInt] = None
+    # Overrides `limit` for individual children
+    limits: Dict[int, NonNegativeInt] = Field(default_factory=dict, max_length=100)
+    # Also list archived expenses, ranked together with recent ones; summaries always include them
+    include_archived: bool = False
+
+class ChildBatchResult(BaseModel):
+    child_id: int
+    expenses: List[Expense]
+    summary: ChildSpendSummary
+
+class ChildrenBatchResponse(BaseModel):
+    children: List[ChildBatchResult]
+    missing_child_ids: List[int]
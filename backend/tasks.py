@@ -0,0 +1,47 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import crud
+from config import settings
+from database import SessionLocal
+
+
+async def _run_forever(name, interval_seconds, job):
+    while True:
+        try:
+            async with SessionLocal() as session:
+                count = await job(session)
+            if count:
+                print(f"{name}: {count} expenses")
+        except Exception as exc:
+            # Keep the job alive; it will retry on the next interval
+            print(f"{name} failed: {exc}")
+        await asyncio.sleep(interval_seconds)
+
+
+async def purge_tombstones_forever():
+    """Periodically hard-delete old soft-deleted expenses in small batches.
+
+    Each batch is its own short transaction, so purging never holds long locks
+    against request traffic.
+    """
+    retention = timedelta(days=settings.EXPENSE_PURGE_RETENTION_DAYS)
+
+    async def job(session):
+        return await crud.purge_deleted_expenses(session, retention, settings.EXPENSE_PURGE_BATCH_SIZE)
+
+    await _run_forever("Purged deleted", settings.EXPENSE_PURGE_INTERVAL_SECONDS, job)
+
+
+async def archive_expenses_forever():
+    """Periodically move expenses older than the archive cutoff out of the hot table.
+
+    Only started when EXPENSE_ARCHIVE_AFTER_DAYS is set.
+    """
+
+    async def job(session):
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        cutoff = now - timedelta(days=settings.EXPENSE_ARCHIVE_AFTER_DAYS)
+        return await crud.archive_expenses(session, cutoff, settings.EXPENSE_ARCHIVE_BATCH_SIZE)
+
+    await _run_forever("Archived", settings.EXPENSE_ARCHIVE_INTERVAL_SECONDS, job)
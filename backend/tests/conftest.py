@@ -7,7 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from database import Base, get_db
+from database import Base, enable_archive, get_db
 from main import app
 
 
@@ -25,6 +25,7 @@ async def db_engine():
         connect_args={"check_same_thread": False},
         poolclass=StaticPool
     )
+    enable_archive(engine, ":memory:")
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -0,0 +1,126 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select, update
+
+import crud
+from models import ArchivedExpense, ArchivedExpenseTotal, Child, Expense
+
+
+@pytest.mark.asyncio
+async def test_archive_moves_old_expenses_and_keeps_totals(client, db_session):
+    child = Child(name="ArchiveChild")
+    db_session.add(child)
+    await db_session.commit()
+    await db_session.refresh(child)
+
+    expenses = [
+        (10.0, "cash", "2022-07-01T10:00:00"),
+        (20.0, "card", "2022-07-02T10:00:00"),
+        (5.0, "cash", "2023-08-01T10:00:00"),
+        (1.0, "cash", "2024-08-01T10:00:00"),
+    ]
+    for amount, category, date in expenses:
+        resp = await client.post(
+            "/expenses",
+            json={"amount": amount, "description": "Thing", "date": date, "child_id": child.id, "category": category},
+            headers={"X-Admin-PIN": "1122"}
+        )
+        assert resp.status_code == 200
+
+    before = (await client.get(f"/children/{child.id}/total")).json()
+
+    # Small batches so the totals upsert has to accumulate across transactions
+    archived = await crud.archive_expenses(db_session, datetime(2024, 1, 1), batch_size=2)
+    assert archived == 3
+
+    after = (await client.get(f"/children/{child.id}/total")).json()
+    assert after == before
+    assert after["total_amount"] == 36.0
+    assert after["total_cash"] == 16.0
+    assert after["total_card"] == 20.0
+
+    totals = await db_session.execute(
+        select(ArchivedExpenseTotal.category, ArchivedExpenseTotal.total_amount, ArchivedExpenseTotal.expense_count)
+        .filter(ArchivedExpenseTotal.child_id == child.id)
+        .order_by(ArchivedExpenseTotal.category)
+    )
+    assert totals.all() == [("card", 20.0, 1), ("cash", 15.0, 2)]
+    archived_rows = await db_session.execute(select(ArchivedExpense))
+    assert len(archived_rows.scalars().all()) == 3
+
+    hot = (await client.get(f"/children/{child.id}/expenses")).json()
+    assert [e["amount"] for e in hot] == [1.0]
+
+    everything = (await client.get(f"/children/{child.id}/expenses", params={"include_archived": True})).json()
+    assert [e["amount"] for e in everything] == [1.0, 5.0, 20.0, 10.0]
+
+    # Nothing left to archive
+    assert await crud.archive_expenses(db_session, datetime(2024, 1, 1), batch_size=2) == 0
+
+@pytest.mark.asyncio
+async def test_archived_expense_ids_are_not_reused(client, db_session):
+    child = Child(name="ArchiveIdChild")
+    db_session.add(child)
+    await db_session.commit()
+    await db_session.refresh(child)
+
+    async def create(description, date):
+        resp = await client.post(
+            "/expenses",
+            json={"amount": 1.0, "description": description, "date": date, "child_id": child.id},
+            headers={"X-Admin-PIN": "1122"}
+        )
+        assert resp.status_code == 200
+        return resp.json()["id"]
+
+    recent_id = await create("recent", "2025-06-01T10:00:00")
+    # The backdated entry has the highest id, which SQLite would otherwise hand out again
+    backdated_id = await create("backdated", "2022-06-01T10:00:00")
+    assert await crud.archive_expenses(db_session, datetime(2024, 1, 1), batch_size=10) == 1
+
+    new_id = await create("new", "2025-07-01T10:00:00")
+    assert new_id not in (recent_id, backdated_id)
+
+    everything = (await client.get(f"/children/{child.id}/expenses", params={"include_archived": True})).json()
+    assert [(e["id"], e["description"]) for e in everything] == [
+        (new_id, "new"), (recent_id, "recent"), (backdated_id, "backdated")
+    ]
+
+@pytest.mark.asyncio
+async def test_archive_skips_expense_deleted_after_batch_selected(db_session, monkeypatch):
+    child = Child(name="ArchiveRaceChild")
+    db_session.add(child)
+    await db_session.commit()
+    await db_session.refresh(child)
+
+    old = datetime(2022, 7, 1)
+    kept = Expense(amount=10.0, description="Kept", date=old, child_id=child.id)
+    raced = Expense(amount=99.0, description="Deleted mid-batch", date=old, child_id=child.id)
+    db_session.add_all([kept, raced])
+    await db_session.commit()
+
+    # Soft-delete one expense right after the batch ids have been selected
+    execute = db_session.execute
+    calls = []
+
+    async def racing_execute(statement, *args, **kwargs):
+        result = await execute(statement, *args, **kwargs)
+        if not calls:
+            calls.append(statement)
+            await execute(update(Expense).where(Expense.id == raced.id).values(deleted_at=datetime(2024, 1, 1)))
+        return result
+
+    monkeypatch.setattr(db_session, "execute", racing_execute)
+    assert await crud.archive_expenses(db_session, datetime(2024, 1, 1), batch_size=10) == 1
+    monkeypatch.undo()
+
+    archived = await db_session.execute(select(ArchivedExpense.description))
+    assert archived.scalars().all() == ["Kept"]
+    totals = await db_session.execute(
+        select(ArchivedExpenseTotal.total_amount).filter(ArchivedExpenseTotal.child_id == child.id)
+    )
+    assert totals.scalars().all() == [10.0]
+
+    # The deleted expense is still a restorable tombstone
+    assert await crud.restore_expense(db_session, raced.id) is not None
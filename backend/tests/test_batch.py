@@ -0,0 +1,103 @@
+from datetime import datetime
+
+import pytest
+
+import crud
+from models import Child
+
+
+@pytest.mark.asyncio
+async def test_read_children_batch(client, db_session):
+    first = Child(name="BatchOne")
+    second = Child(name="BatchTwo")
+    empty = Child(name="BatchEmpty")
+    db_session.add_all([first, second, empty])
+    await db_session.commit()
+
+    expenses = [
+        (first.id, 1.0, "cash", "2023-10-01T10:00:00"),
+        (first.id, 2.0, "card", "2023-10-02T10:00:00"),
+        (first.id, 3.0, "cash", "2023-10-03T10:00:00"),
+        (second.id, 4.0, "cash", "2023-10-01T10:00:00"),
+        (second.id, 5.0, "card", "2023-10-02T10:00:00"),
+    ]
+    for child_id, amount, category, date in expenses:
+        resp = await client.post(
+            "/expenses",
+            json={"amount": amount, "description": "Thing", "date": date, "child_id": child_id, "category": category},
+            headers={"X-Admin-PIN": "1122"}
+        )
+        assert resp.status_code == 200
+
+    resp = await client.post(
+        "/children/batch",
+        json={
+            "child_ids": [second.id, 999, first.id, empty.id],
+            "limit": 2,
+            # The limit for the missing id is ignored
+            "limits": {str(second.id): 1, "999": 5},
+        },
+    )
+    assert resp.status_code == 200, resp.text
+    data = resp.json()
+
+    assert data["missing_child_ids"] == [999]
+    results = {item["child_id"]: item for item in data["children"]}
+    assert [item["child_id"] for item in data["children"]] == [second.id, first.id, empty.id]
+
+    # Limits only apply to the expense list, totals cover everything
+    assert [e["amount"] for e in results[first.id]["expenses"]] == [3.0, 2.0]
+    assert results[first.id]["summary"] == {
+        "child_id": first.id, "total_amount": 6.0, "total_cash": 4.0, "total_card": 2.0
+    }
+    assert [e["amount"] for e in results[second.id]["expenses"]] == [5.0]
+    assert results[second.id]["summary"]["total_amount"] == 9.0
+    assert results[empty.id]["expenses"] == []
+    assert results[empty.id]["summary"]["total_amount"] == 0.0
+
+@pytest.mark.asyncio
+async def test_read_children_batch_validation(client):
+    resp = await client.post("/children/batch", json={"child_ids": []})
+    assert resp.status_code == 422
+
+    resp = await client.post("/children/batch", json={"child_ids": [1], "limit": -1})
+    assert resp.status_code == 422
+
+    resp = await client.post("/children/batch", json={"child_ids": [1], "limits": {str(i): 1 for i in range(101)}})
+    assert resp.status_code == 422
+
+@pytest.mark.asyncio
+async def test_read_children_batch_include_archived(client, db_session):
+    child = Child(name="BatchArchive")
+    db_session.add(child)
+    await db_session.commit()
+
+    expenses = [
+        (1.0, "2022-07-01T10:00:00"),
+        (2.0, "2022-08-01T10:00:00"),
+        (3.0, "2025-07-01T10:00:00"),
+    ]
+    for amount, date in expenses:
+        resp = await client.post(
+            "/expenses",
+            json={"amount": amount, "description": "Thing", "date": date, "child_id": child.id},
+            headers={"X-Admin-PIN": "1122"}
+        )
+        assert resp.status_code == 200
+    assert await crud.archive_expenses(db_session, datetime(2024, 1, 1), batch_size=10) == 2
+
+    resp = await client.post("/children/batch", json={"child_ids": [child.id]})
+    result = resp.json()["children"][0]
+    assert [e["amount"] for e in result["expenses"]] == [3.0]
+    assert result["summary"]["total_amount"] == 6.0
+
+    # Archived rows are ranked with hot ones, so the limit still applies across both
+    resp = await client.post("/children/batch", json={"child_ids": [child.id], "limit": 2, "include_archived": True})
+    assert resp.status_code == 200, resp.text
+    result = resp.json()["children"][0]
+    assert [e["amount"] for e in result["expenses"]] == [3.0, 2.0]
+
+    resp = await client.post("/children/batch", json={"child_ids": [child.id], "include_archived": True})
+    result = resp.json()["children"][0]
+    assert [e["amount"] for e in result["expenses"]] == [3.0, 2.0, 1.0]
+    assert sum(e["amount"] for e in result["expenses"]) == result["summary"]["total_amount"]
@@ -1,6 +1,10 @@
+from datetime import datetime, timedelta
+
 import pytest
+from sqlalchemy import select
 
-from models import Child
+import crud
+from models import Child, Expense
 
 
 @pytest.mark.asyncio
@@ -56,3 +60,62 @@ async def test_delete_expense_invalid_pin(client):
         headers={"X-Admin-PIN": "WRONG"}
     )
     assert delete_resp.status_code == 401
+
+@pytest.mark.asyncio
+async def test_delete_expense_is_soft_and_restorable(client, db_session):
+    child = Child(name="RestoreTestChild")
+    db_session.add(child)
+    await db_session.commit()
+    await db_session.refresh(child)
+
+    create_resp = await client.post(
+        "/expenses",
+        json={"amount": 12.5, "description": "Oops", "date": "2023-11-02T12:00:00", "child_id": child.id},
+        headers={"X-Admin-PIN": "1122"}
+    )
+    expense_id = create_resp.json()["id"]
+
+    delete_resp = await client.delete(f"/expenses/{expense_id}", headers={"X-Admin-PIN": "1122"})
+    assert delete_resp.status_code == 200
+
+    # Tombstone is still in the table but hidden from reads and totals
+    tombstone = await db_session.get(Expense, expense_id)
+    assert tombstone is not None
+    assert tombstone.deleted_at is not None
+    total_resp = await client.get(f"/children/{child.id}/total")
+    assert total_resp.json()["total_amount"] == 0.0
+
+    # Deleting twice is a 404
+    again_resp = await client.delete(f"/expenses/{expense_id}", headers={"X-Admin-PIN": "1122"})
+    assert again_resp.status_code == 404
+
+    restore_resp = await client.post(f"/expenses/{expense_id}/restore", headers={"X-Admin-PIN": "1122"})
+    assert restore_resp.status_code == 200
+    assert restore_resp.json()["id"] == expense_id
+
+    get_resp = await client.get(f"/children/{child.id}/expenses")
+    assert [e["id"] for e in get_resp.json()] == [expense_id]
+
+    # Restoring a live expense is a 404
+    restore_again = await client.post(f"/expenses/{expense_id}/restore", headers={"X-Admin-PIN": "1122"})
+    assert restore_again.status_code == 404
+
+@pytest.mark.asyncio
+async def test_purge_deleted_expenses_in_batches(db_session):
+    child = Child(name="PurgeTestChild")
+    db_session.add(child)
+    await db_session.commit()
+    await db_session.refresh(child)
+
+    old = datetime(2020, 1, 1)
+    for i in range(5):
+        db_session.add(Expense(amount=1.0, description=f"Old {i}", date=old, child_id=child.id, deleted_at=old))
+    db_session.add(Expense(amount=1.0, description="Recent", date=old, child_id=child.id, deleted_at=crud._utcnow()))
+    db_session.add(Expense(amount=1.0, description="Live", date=old, child_id=child.id))
+    await db_session.commit()
+
+    purged = await crud.purge_deleted_expenses(db_session, timedelta(days=30), batch_size=2)
+    assert purged == 5
+
+    result = await db_session.execute(select(Expense.description).order_by(Expense.description))
+    assert result.scalars().all() == ["Live", "Recent"]
@@ -0,0 +1,76 @@
+import pytest
+from alembic.config import Config
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import main
+from alembic import command
+from database import enable_archive
+from migrations import ALEMBIC_INI, ensure_schema, head_revision
+
+
+@pytest.mark.asyncio
+async def test_healthz(client):
+    resp = await client.get("http://test/healthz")
+    assert resp.status_code == 200
+    assert resp.json() == {"status": "ok"}
+
+@pytest.mark.asyncio
+async def test_readyz(client, db_session, monkeypatch):
+    readiness = main.Readiness(ttl=60)
+    monkeypatch.setattr(main, "readiness", readiness)
+
+    pings = []
+    execute = db_session.execute
+
+    async def counting_execute(statement, *args, **kwargs):
+        pings.append(statement)
+        return await execute(statement, *args, **kwargs)
+
+    monkeypatch.setattr(db_session, "execute", counting_execute)
+
+    # Not ready until startup has prepared the schema, and no database hit meanwhile
+    resp = await client.get("http://test/readyz")
+    assert resp.status_code == 503
+    assert pings == []
+
+    readiness.mark_schema_ready()
+    resp = await client.get("http://test/readyz")
+    assert resp.status_code == 200
+    assert resp.json() == {"status": "ready"}
+    assert len(pings) == 1
+
+    # Within the TTL the cached ping is reused
+    resp = await client.get("http://test/readyz")
+    assert resp.status_code == 200
+    assert len(pings) == 1
+
+    # Once it expires the database is pinged again
+    readiness.ttl = 0
+    resp = await client.get("http://test/readyz")
+    assert resp.status_code == 200
+    assert len(pings) == 2
+
+@pytest.mark.asyncio
+async def test_ensure_schema_runs_pending_migrations(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'startup.db'}")
+    enable_archive(engine, str(tmp_path / "startup_archive.db"))
+    try:
+        assert await ensure_schema(engine, run_migrations=False) is False
+        assert await ensure_schema(engine, run_migrations=True) is True
+        async with engine.connect() as conn:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+            assert result.scalar() == head_revision()
+        # Already at head: nothing to do
+        assert await ensure_schema(engine, run_migrations=False) is True
+
+        # Models and migrations agree, including the archive schema
+        def check(sync_conn):
+            config = Config(ALEMBIC_INI)
+            config.attributes["connection"] = sync_conn
+            command.check(config)
+
+        async with engine.connect() as conn:
+            await conn.run_sync(check)
+    finally:
+        await engine.dispose()
@@ -0,0 +1,64 @@
+import os
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from config import normalize_database_url, settings
+from database import archive_path_for
+from models import Child, Expense
+from tools.generate_data import expense_rows, generate
+from tools.profile_crud import profile
+
+
+def test_expense_rows_are_realistic():
+    rows = list(expense_rows([1, 2, 3], 2000, years=2, seed=42))
+    assert len(rows) == 2000
+
+    now = datetime.now()
+    for amount, description, category, date, child_id in rows:
+        assert 0.2 <= amount <= 250.0
+        assert category in ("cash", "card")
+        assert date <= now
+        assert child_id in (1, 2, 3)
+
+    # Holidays dominate, summer most of all
+    months = [row[3].month for row in rows]
+    assert months.count(8) > months.count(2)
+    assert months.count(3) == 0
+
+@pytest.mark.asyncio
+async def test_generate_and_profile(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'synthetic.db'}"
+
+    child_ids = await generate(url, children=5, expenses=1200, years=2, batch_size=500, seed=1)
+    assert len(child_ids) == 5
+    # The archive lives next to the target database, not at the app's ARCHIVE_SQLITE_PATH
+    assert os.path.exists(tmp_path / "synthetic_archive.db")
+
+    # A second run grows the same dataset instead of clashing on child names
+    more_ids = await generate(url, children=3, expenses=300, years=2, batch_size=500, seed=2)
+    assert len(more_ids) == 3
+    assert not set(more_ids) & set(child_ids)
+
+    engine = create_async_engine(url)
+    async with engine.connect() as conn:
+        assert (await conn.execute(select(func.count()).select_from(Expense))).scalar() == 1500
+        names = await conn.execute(select(Child.name).order_by(Child.name))
+        assert names.scalars().all() == [f"Synthetic {i:06d}" for i in range(8)]
+    await engine.dispose()
+
+    output_dir = tmp_path / "profiles"
+    await profile(url, str(output_dir), repeat=2, sample_children=3)
+    for suffix in ("pstats", "folded", "plans.txt"):
+        assert os.path.exists(output_dir / f"get_child_total_expense.{suffix}")
+    assert "SELECT" in (output_dir / "get_children_totals.plans.txt").read_text()
+
+
+def test_archive_path_and_url_normalisation():
+    assert archive_path_for("sqlite+aiosqlite:///./big.db") == "./big_archive.db"
+    assert archive_path_for("sqlite+aiosqlite:///:memory:") == ":memory:"
+    assert archive_path_for(settings.DATABASE_URL) == settings.ARCHIVE_SQLITE_PATH
+    assert normalize_database_url("postgres://u:p@host/db") == "postgresql+asyncpg://u:p@host/db"
+    assert normalize_database_url("postgresql://u:p@host/db") == "postgresql+asyncpg://u:p@host/db"
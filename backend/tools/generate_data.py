@@ -0,0 +1,167 @@
+"""Generate a large synthetic dataset of children and expenses.
+
+Usage (from the backend directory):
+
+    python -m tools.generate_data --children 200 --expenses 2000000
+
+Rows are bulk-loaded with COPY on Postgres and with executemany in large
+transactions on SQLite. The target database is migrated to head first. Running
+again against the same database adds more children and expenses to it.
+"""
+import argparse
+import asyncio
+import itertools
+import random
+import time
+from datetime import datetime
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from config import normalize_database_url, settings
+from database import archive_path_for, enable_archive
+from migrations import ensure_schema
+from models import Child, Expense
+
+COLUMNS = ["amount", "description", "category", "date", "child_id"]
+
+# (month, first day, last day, weight): rough UK school holidays, summer dominates
+HOLIDAYS = [
+    (2, 12, 20, 1),
+    (4, 1, 14, 2),
+    (5, 25, 31, 1),
+    (7, 20, 31, 3),
+    (8, 1, 31, 6),
+    (10, 21, 29, 1),
+    (12, 18, 31, 3),
+]
+
+DESCRIPTIONS = {
+    "cash": ["Ice cream", "Arcade", "Sweets", "Pocket money", "Beach toys", "Donkey ride", "Crazy golf"],
+    "card": ["Souvenir", "Theme park ride", "Book", "Toy shop", "Cinema", "Museum gift shop", "Meal out"],
+}
+
+
+def expense_rows(child_ids, count, years, seed=None):
+    """Yield `count` realistic expense tuples in COLUMNS order."""
+    rng = random.Random(seed)
+    # A few children spend far more often than the rest. Cumulative weights keep
+    # each draw O(log n) rather than O(n) over millions of rows.
+    child_weights = list(itertools.accumulate(rng.paretovariate(1.5) for _ in child_ids))
+    holiday_weights = list(itertools.accumulate(weight for *_, weight in HOLIDAYS))
+    now = datetime.now()
+
+    for _ in range(count):
+        child_id = rng.choices(child_ids, cum_weights=child_weights)[0]
+        month, first, last, _weight = rng.choices(HOLIDAYS, cum_weights=holiday_weights)[0]
+        year = now.year - rng.randrange(years)
+        hour = min(max(int(rng.gauss(14, 3)), 8), 21)
+        when = datetime(year, month, rng.randint(first, last), hour, rng.randrange(60))
+        if when > now:
+            # This year's holiday hasn't happened yet
+            when = when.replace(year=year - 1)
+
+        category = "cash" if rng.random() < 0.65 else "card"
+        # Mostly small purchases with a long tail of bigger ones
+        amount = round(min(max(rng.lognormvariate(1.4, 0.9), 0.2), 250.0), 2)
+        description = rng.choice(DESCRIPTIONS[category])
+        yield (amount, description, category, when, child_id)
+
+
+def batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def create_children(conn, count, prefix):
+    # Names are unique, so continue numbering after children from earlier runs with this prefix
+    existing = await conn.execute(select(Child.name).where(Child.name.startswith(f"{prefix} ", autoescape=True)))
+    suffixes = [name[len(prefix) + 1:] for name in existing.scalars().all()]
+    start = max((int(suffix) + 1 for suffix in suffixes if suffix.isdigit()), default=0)
+
+    result = await conn.execute(
+        insert(Child).returning(Child.id),
+        [{"name": f"{prefix} {i:06d}"} for i in range(start, start + count)],
+    )
+    return result.scalars().all()
+
+
+async def copy_expenses(conn, batch):
+    # asyncpg's COPY protocol is far faster than INSERTs for bulk loads
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table("expenses", records=batch, columns=COLUMNS)
+
+
+async def insert_expenses(conn, batch):
+    await conn.execute(insert(Expense), [dict(zip(COLUMNS, row)) for row in batch])
+
+
+async def generate(
+    database_url, children, expenses, years, batch_size, seed=None, prefix="Synthetic", archive_path=None
+):
+    database_url = normalize_database_url(database_url)
+    engine = create_async_engine(database_url)
+    enable_archive(engine, archive_path or archive_path_for(database_url))
+    try:
+        await ensure_schema(engine, run_migrations=True)
+        is_postgres = engine.dialect.name == "postgresql"
+
+        async with engine.begin() as conn:
+            child_ids = await create_children(conn, children, prefix)
+
+        loaded = 0
+        started = time.perf_counter()
+        for batch in batches(expense_rows(child_ids, expenses, years, seed), batch_size):
+            # One transaction per batch keeps memory and lock time bounded
+            async with engine.begin() as conn:
+                if is_postgres:
+                    await copy_expenses(conn, batch)
+                else:
+                    await insert_expenses(conn, batch)
+            loaded += len(batch)
+            print(f"Loaded {loaded}/{expenses} expenses ({loaded / (time.perf_counter() - started):,.0f} rows/s)")
+
+        # Fresh statistics so the planner sees the new data distribution
+        async with engine.begin() as conn:
+            await conn.exec_driver_sql("ANALYZE")
+        return child_ids
+    finally:
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument(
+        "--archive-path",
+        default=None,
+        help="SQLite archive file to attach (default: <database>_archive.db next to --database-url)",
+    )
+    parser.add_argument("--children", type=int, default=100)
+    parser.add_argument("--expenses", type=int, default=1_000_000)
+    parser.add_argument("--years", type=int, default=3, help="Spread expenses over this many years of holidays")
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--prefix", default="Synthetic", help="Name prefix for generated children")
+    args = parser.parse_args()
+
+    asyncio.run(generate(
+        args.database_url,
+        args.children,
+        args.expenses,
+        args.years,
+        args.batch_size,
+        args.seed,
+        args.prefix,
+        args.archive_path,
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""Profile the crud.py functions against an existing (ideally large) database.
+
+Usage (from the backend directory, after tools.generate_data):
+
+    python -m tools.profile_crud --output-dir profiles --repeat 20
+
+For every profiled function this writes to the output directory:
+
+    <name>.pstats     cProfile stats (snakeviz, flameprof, gprof2dot)
+    <name>.folded     sampled stacks in collapsed format (flamegraph.pl, speedscope, inferno)
+    <name>.plans.txt  the query plan of every distinct statement the function ran
+
+Archiving and purging are batch jobs that rewrite the table, so they are not profiled here.
+"""
+import argparse
+import asyncio
+import cProfile
+import os
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import delete, event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import crud
+import schemas
+from config import normalize_database_url, settings
+from database import archive_path_for, enable_archive
+from models import Expense
+
+
+class StackSampler:
+    """Samples one thread's Python stack on a timer and counts collapsed stacks."""
+
+    def __init__(self, thread_id, interval=0.001):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def write(self, path):
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class StatementRecorder:
+    """Collects the distinct SQL statements (with example parameters) run on an engine."""
+
+    def __init__(self, engine):
+        self.engine = engine.sync_engine
+        self.statements = {}
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            self.statements.setdefault(statement, parameters)
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+
+async def explain(engine, statements):
+    prefix = "EXPLAIN " if engine.dialect.name == "postgresql" else "EXPLAIN QUERY PLAN "
+    plans = []
+    async with engine.connect() as conn:
+        for statement, parameters in statements.items():
+            if not statement.lstrip().upper().startswith(("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")):
+                continue
+            # Plain EXPLAIN only plans the statement, so writes are not applied
+            result = await conn.exec_driver_sql(prefix + statement, parameters)
+            plan = "\n".join(" | ".join(str(value) for value in row) for row in result.all())
+            plans.append(f"{statement}\n-- parameters: {parameters!r}\n{plan}\n")
+        await conn.rollback()
+    return plans
+
+
+def workloads(child_id, child_ids, scratch_id):
+    """(name, call, before, after) for each profiled function; before/after run unprofiled."""
+    expense = schemas.ExpenseCreate(
+        amount=4.5, description="Profiling", category="cash", date=datetime.now(), child_id=child_id
+    )
+    return [
+        ("get_children", lambda db: crud.get_children(db), None, None),
+        ("get_child", lambda db: crud.get_child(db, child_id), None, None),
+        ("get_expenses_by_child", lambda db: crud.get_expenses_by_child(db, child_id), None, None),
+        (
+            "get_expenses_by_child_include_archived",
+            lambda db: crud.get_expenses_by_child(db, child_id, include_archived=True),
+            None,
+            None,
+        ),
+        ("get_child_total_expense", lambda db: crud.get_child_total_expense(db, child_id), None, None),
+        ("get_expenses_for_children", lambda db: crud.get_expenses_for_children(db, child_ids, 20), None, None),
+        ("get_children_totals", lambda db: crud.get_children_totals(db, child_ids), None, None),
+        ("create_expense", lambda db: crud.create_expense(db, expense.model_copy()), None, None),
+        (
+            "update_expense",
+            lambda db: crud.update_expense(db, scratch_id, schemas.ExpenseUpdate(amount=5.5)),
+            None,
+            None,
+        ),
+        (
+            "delete_expense",
+            lambda db: crud.delete_expense(db, scratch_id),
+            None,
+            lambda db: crud.restore_expense(db, scratch_id),
+        ),
+        (
+            "restore_expense",
+            lambda db: crud.restore_expense(db, scratch_id),
+            lambda db: crud.delete_expense(db, scratch_id),
+            None,
+        ),
+    ]
+
+
+async def profile(database_url, output_dir, repeat, sample_children, archive_path=None):
+    os.makedirs(output_dir, exist_ok=True)
+    database_url = normalize_database_url(database_url)
+    engine = create_async_engine(database_url)
+    enable_archive(engine, archive_path or archive_path_for(database_url))
+    Session = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    main_thread = threading.get_ident()
+
+    try:
+        async with Session() as db:
+            # Profile against the busiest children, where the hot paths hurt most
+            busiest = await db.execute(
+                select(Expense.child_id)
+                .group_by(Expense.child_id)
+                .order_by(func.count().desc())
+                .limit(sample_children)
+            )
+            child_ids = busiest.scalars().all()
+            if not child_ids:
+                sys.exit("No expenses found; run `python -m tools.generate_data` first")
+            scratch = await crud.create_expense(db, schemas.ExpenseCreate(
+                amount=1.0, description="Profiling scratch", date=datetime.now(), child_id=child_ids[0]
+            ))
+            started_at = datetime.now()
+
+        try:
+            print(f"{'function':<40} {'calls':>6} {'mean ms':>10} {'p95 ms':>10}")
+            for name, call, before, after in workloads(child_ids[0], child_ids, scratch.id):
+                profiler = cProfile.Profile()
+                sampler = StackSampler(main_thread)
+                recorder = StatementRecorder(engine)
+                timings = []
+                for _ in range(repeat):
+                    async with Session() as db:
+                        if before:
+                            await before(db)
+                        with sampler, recorder:
+                            start = time.perf_counter()
+                            profiler.enable()
+                            await call(db)
+                            profiler.disable()
+                            timings.append((time.perf_counter() - start) * 1000)
+                        if after:
+                            await after(db)
+
+                profiler.dump_stats(os.path.join(output_dir, f"{name}.pstats"))
+                sampler.write(os.path.join(output_dir, f"{name}.folded"))
+                with open(os.path.join(output_dir, f"{name}.plans.txt"), "w") as f:
+                    f.write("\n".join(await explain(engine, recorder.statements)))
+
+                p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+                print(f"{name:<40} {len(timings):>6} {statistics.mean(timings):>10.2f} {p95:>10.2f}")
+        finally:
+            # Remove the rows the write workloads added, even if profiling failed
+            async with Session() as db:
+                await db.execute(delete(Expense).where(Expense.id == scratch.id))
+                await db.execute(
+                    delete(Expense).where(Expense.description == "Profiling", Expense.date >= started_at)
+                )
+                await db.commit()
+    finally:
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument(
+        "--archive-path",
+        default=None,
+        help="SQLite archive file to attach (default: <database>_archive.db next to --database-url)",
+    )
+    parser.add_argument("--output-dir", default="profiles")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--sample-children", type=int, default=10, help="Children used by the batch reads")
+    args = parser.parse_args()
+
+    asyncio.run(profile(args.database_url, args.output_dir, args.repeat, args.sample_children, args.archive_path))
+
+
+if __name__ == "__main__":
+    main()